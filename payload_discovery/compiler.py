@@ -8,18 +8,46 @@ PayloadDiscovery JSON configuration that maps every single file.
 
 import os
 import re
+import sys
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+from collections import defaultdict
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 
-from .core import PayloadDiscovery, PayloadDiscoveryPiece, safe_write_config
+from .core import PayloadDiscovery, PayloadDiscoveryPiece, safe_write_config, _DATACLASS_SLOTS
 
 logger = logging.getLogger(__name__)
 
+_SEQ_RE = re.compile(r'^(\d+)_')
+_TITLE_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
 
-@dataclass
+# Content categorization only looks at the start of a document, where titles
+# and section headers live, so large files don't cost a full scan per rule
+_CONTENT_SCAN_LIMIT = 4096
+
+# Markdown reads are I/O bound, so allow more threads than cores
+_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _compile_rules(rules: Tuple[Tuple[str, str], ...]) -> Tuple["re.Pattern[str]", Tuple[str, ...]]:
+    """
+    Fuse ordered (lookahead regex, piece_type) rules into one pattern.
+    
+    Each rule becomes a capturing alternative anchored at the start of the
+    text, so a single case-insensitive match() keeps first-rule-wins priority
+    and match.lastindex identifies the rule that fired.
+    """
+    pattern = re.compile(
+        "|".join(f"({regex})" for regex, _ in rules),
+        re.IGNORECASE | re.DOTALL
+    )
+    return pattern, tuple(piece_type for _, piece_type in rules)
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class FileMapping:
     """Represents a discovered file and its extracted metadata."""
     filepath: Path
@@ -31,12 +59,13 @@ class FileMapping:
     directory: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class CompilerConfig:
     """Configuration for PayloadDiscovery compilation."""
     domain_name: Optional[str] = None
     version: str = "v01" 
     description: str = ""
+    validate: bool = True
 
 
 class PayloadDiscoveryCompiler:
@@ -46,88 +75,68 @@ class PayloadDiscoveryCompiler:
     Performs complete 1-to-1 mapping of every file in the source directory.
     """
     
+    # Categorization rules, shared by all compiler instances. Order matters:
+    # the first rule found anywhere in the text decides the piece type.
+    _FILENAME_RE, _FILENAME_TYPES = _compile_rules((
+        (r'(?=.*?readme)', 'overview'),
+        (r'(?=.*?master_prompt)', 'master_prompt'),
+        (r'(?=.*?architecture)', 'architecture'),
+        (r'(?=.*?overview)', 'overview'),
+        (r'(?=.*?summary)', 'summary'),
+        (r'(?=.*?example)', 'example'),
+        (r'(?=.*?dsl)', 'dsl'),
+        (r'(?=.*?visual)', 'visual'),
+        (r'(?=.*?guide)', 'guide'),
+        (r'(?=.*?quick_?start)', 'quickstart'),
+    ))
+    _DIRECTORY_RE, _DIRECTORY_TYPES = _compile_rules((
+        (r'(?=.*?instruction)', 'instruction'),
+        (r'(?=.*?research)', 'research'),
+        (r'(?=.*?roadmap)', 'roadmap'),
+        (r'(?=.*?test)', 'test_case'),
+    ))
+    _CONTENT_RE, _CONTENT_TYPES = _compile_rules((
+        (r'(?=.*?workflow)(?=.*?notation)', 'workflow'),
+        (r'(?=.*?implementation)', 'implementation'),
+        (r'(?=.*?architecture)', 'architecture'),
+        (r'(?=.*?framework)', 'framework'),
+        (r'(?=.*?ontological)', 'ontological'),
+    ))
+    
     def __init__(self):
         self.file_mappings: List[FileMapping] = []
-        self.sequence_pattern = re.compile(r'^(\d+)_')
-        self.title_pattern = re.compile(r'^#\s+(.+)$', re.MULTILINE)
     
     def _extract_sequence_number(self, filename: str) -> Optional[int]:
         """Extract sequence number from filename like '00_Overview.md'."""
-        match = self.sequence_pattern.match(filename)
+        match = _SEQ_RE.match(filename)
         if match:
             return int(match.group(1))
         return None
     
     def _extract_title_from_content(self, content: str) -> str:
         """Extract title from first # header in content."""
-        match = self.title_pattern.search(content)
+        match = _TITLE_RE.search(content)
         if match:
             return match.group(1).strip()
         return "Untitled"
     
     def _categorize_by_filename(self, filename: str) -> Optional[str]:
         """Categorize piece type by filename patterns."""
-        filename_lower = filename.lower()
-        
-        filename_patterns = {
-            'readme': 'overview',
-            'master_prompt': 'master_prompt', 
-            'architecture': 'architecture',
-            'overview': 'overview',
-            'summary': 'summary',
-            'example': 'example',
-            'dsl': 'dsl',
-            'visual': 'visual',
-            'guide': 'guide'
-        }
-        
-        for pattern, piece_type in filename_patterns.items():
-            if pattern in filename_lower:
-                return piece_type
-        
-        if 'quick_start' in filename_lower or 'quickstart' in filename_lower:
-            return 'quickstart'
-            
-        return None
+        match = self._FILENAME_RE.match(filename)
+        return self._FILENAME_TYPES[match.lastindex - 1] if match else None
     
     def _categorize_by_directory(self, directory: Optional[str]) -> Optional[str]:
         """Categorize piece type by directory context."""
         if not directory:
             return None
-            
-        dir_lower = directory.lower()
-        dir_patterns = {
-            'instruction': 'instruction',
-            'research': 'research', 
-            'roadmap': 'roadmap',
-            'test': 'test_case'
-        }
-        
-        for pattern, piece_type in dir_patterns.items():
-            if pattern in dir_lower:
-                return piece_type
         
-        return None
+        match = self._DIRECTORY_RE.match(directory)
+        return self._DIRECTORY_TYPES[match.lastindex - 1] if match else None
     
     def _categorize_by_content(self, content: str) -> Optional[str]:
-        """Categorize piece type by content patterns."""
-        content_lower = content.lower()
-        
-        if 'workflow' in content_lower and 'notation' in content_lower:
-            return 'workflow'
-        
-        content_patterns = {
-            'implementation': 'implementation',
-            'architecture': 'architecture',
-            'framework': 'framework', 
-            'ontological': 'ontological'
-        }
-        
-        for pattern, piece_type in content_patterns.items():
-            if pattern in content_lower:
-                return piece_type
-        
-        return None
+        """Categorize piece type by content patterns in the first few KB."""
+        match = self._CONTENT_RE.match(content, 0, _CONTENT_SCAN_LIMIT)
+        return self._CONTENT_TYPES[match.lastindex - 1] if match else None
     
     def _categorize_piece_type(self, filename: str, content: str, directory: Optional[str]) -> str:
         """Categorize the piece type based on filename, content, and directory."""
@@ -149,24 +158,24 @@ class PayloadDiscoveryCompiler:
         # Default fallback
         return 'instruction'
     
-    def _infer_dependencies(self, sequence_num: int, all_sequences: List[int]) -> List[int]:
+    def _infer_dependencies(self, sequence_num: int, all_sequences: Set[int]) -> List[int]:
         """Infer dependencies based on sequence order."""
         # Simple heuristic: depend on the previous sequence number if it exists
         if sequence_num > 0 and (sequence_num - 1) in all_sequences:
             return [sequence_num - 1]
         return []
     
-    def _get_directory_name(self, md_file: Path, relative_to: Path) -> Optional[str]:
-        """Get relative directory name for a markdown file."""
-        relative_dir = md_file.parent.relative_to(relative_to)
-        return str(relative_dir) if str(relative_dir) != '.' else None
+    def _get_directory_name(self, parent_dir: str, root_dir: str) -> Optional[str]:
+        """Get relative directory name of parent_dir under root_dir."""
+        relative_dir = parent_dir[len(root_dir):].lstrip(os.sep)
+        return relative_dir or None
     
-    def _assign_sequence_number(self, filename: str, existing_mappings: List[FileMapping]) -> int:
+    def _assign_sequence_number(self, filename: str, next_auto_seq: int) -> int:
         """Assign sequence number to file (numbered or auto-assigned)."""
         sequence_num = self._extract_sequence_number(filename)
         if sequence_num is None:
             # Assign high sequence numbers to non-numbered files
-            sequence_num = 1000 + len([m for m in existing_mappings if m.sequence_number >= 1000])
+            sequence_num = next_auto_seq
         return sequence_num
     
     def _create_file_mapping(self, md_file: Path, content: str, sequence_num: int, dir_name: Optional[str]) -> FileMapping:
@@ -185,12 +194,18 @@ class PayloadDiscoveryCompiler:
             directory=dir_name
         )
     
-    def _process_markdown_file(self, md_file: Path, relative_to: Path, existing_mappings: List[FileMapping]) -> Optional[FileMapping]:
-        """Process a single markdown file into a FileMapping."""
+    def _read_file(self, md_file: Path) -> Tuple[Path, Optional[str]]:
+        """Read a markdown file, returning None as content if it can't be read."""
         try:
-            content = md_file.read_text(encoding='utf-8')
-            dir_name = self._get_directory_name(md_file, relative_to)
-            sequence_num = self._assign_sequence_number(md_file.name, existing_mappings)
+            return md_file, md_file.read_text(encoding='utf-8')
+        except Exception as e:
+            logger.warning(f"Failed to read {md_file}: {e}")
+            return md_file, None
+    
+    def _build_mapping(self, md_file: Path, content: str, dir_name: Optional[str], next_auto_seq: int) -> Optional[FileMapping]:
+        """Process a single markdown file's content into a FileMapping."""
+        try:
+            sequence_num = self._assign_sequence_number(md_file.name, next_auto_seq)
             
             mapping = self._create_file_mapping(md_file, content, sequence_num, dir_name)
             logger.debug(f"Mapped: {md_file} -> seq:{sequence_num}, type:{mapping.piece_type}")
@@ -200,36 +215,81 @@ class PayloadDiscoveryCompiler:
             logger.warning(f"Failed to process {md_file}: {e}")
             return None
     
+    def _find_markdown_files(self, directory: Path, relative_to: Path) -> List[Tuple[str, Optional[str]]]:
+        """Find all markdown files as sorted (path, directory name) pairs."""
+        found = []
+        start_dir = str(directory)
+        stack = [(start_dir, self._get_directory_name(start_dir, str(relative_to)))]
+        
+        # Explicit DFS over scandir: DirEntry type checks reuse readdir data,
+        # and each directory carries its name relative to the source root
+        while stack:
+            current_dir, rel_dir = stack.pop()
+            try:
+                entries = os.scandir(current_dir)
+            except PermissionError:
+                # Skip unreadable directories rather than failing the whole compile
+                logger.warning(f"Skipping unreadable directory: {current_dir}")
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Interned once per directory; every file below shares it
+                        # and it becomes the grouping key in _group_by_directory
+                        child_rel = sys.intern(f"{rel_dir}{os.sep}{entry.name}" if rel_dir else entry.name)
+                        stack.append((entry.path, child_rel))
+                    elif entry.name.endswith('.md') and entry.is_file():
+                        found.append((entry.path, rel_dir))
+        
+        found.sort()
+        return found
+    
     def _scan_directory(self, directory: Path, relative_to: Path) -> List[FileMapping]:
         """Scan a directory for markdown files and create mappings."""
-        mappings = []
+        found = self._find_markdown_files(directory, relative_to)
+        
+        # Overlap file I/O across threads; mapping stays single-threaded so
+        # auto-assigned sequence numbers follow the sorted path order
+        with ThreadPoolExecutor(max_workers=_READ_WORKERS) as executor:
+            contents = list(executor.map(self._read_file, [Path(path) for path, _ in found]))
         
-        for md_file in directory.rglob('*.md'):
-            mapping = self._process_markdown_file(md_file, relative_to, mappings)
+        mappings = []
+        next_auto_seq = 1000
+        for (md_file, content), (_, dir_name) in zip(contents, found):
+            if content is None:
+                continue
+            mapping = self._build_mapping(md_file, content, dir_name, next_auto_seq)
             if mapping:
                 mappings.append(mapping)
+                # Every mapped file at 1000+ (numbered or not) takes a slot
+                if mapping.sequence_number >= 1000:
+                    next_auto_seq += 1
         
         return mappings
     
     def _group_by_directory(self, mappings: List[FileMapping]) -> Tuple[List[FileMapping], Dict[str, List[FileMapping]]]:
         """Group mappings into root files and directory groups."""
         root_files = []
-        directories = {}
+        directories = defaultdict(list)
         
         for mapping in mappings:
             if mapping.directory is None:
                 root_files.append(mapping)
             else:
-                if mapping.directory not in directories:
-                    directories[mapping.directory] = []
                 directories[mapping.directory].append(mapping)
         
-        return root_files, directories
+        return root_files, dict(directories)
     
-    def _create_payload_pieces(self, mappings: List[FileMapping]) -> List[PayloadDiscoveryPiece]:
-        """Convert FileMapping objects to PayloadDiscoveryPiece objects."""
-        all_sequences = [m.sequence_number for m in mappings]
+    def _create_payload_pieces(self, mappings: List[FileMapping]) -> Tuple[List[PayloadDiscoveryPiece], Optional[PayloadDiscoveryPiece]]:
+        """
+        Convert FileMapping objects to PayloadDiscoveryPiece objects.
+        
+        Returns:
+            Tuple of (pieces, piece with the lowest sequence number or None)
+        """
+        all_sequences = {m.sequence_number for m in mappings}
         pieces = []
+        first_piece = None
         
         for mapping in mappings:
             dependencies = self._infer_dependencies(mapping.sequence_number, all_sequences)
@@ -243,8 +303,10 @@ class PayloadDiscoveryCompiler:
                 dependencies=dependencies
             )
             pieces.append(piece)
+            if first_piece is None or piece.sequence_number < first_piece.sequence_number:
+                first_piece = piece
         
-        return pieces
+        return pieces, first_piece
     
     def _resolve_config(self, source_dir: str, config: CompilerConfig) -> CompilerConfig:
         """Resolve configuration with defaults."""
@@ -284,25 +346,20 @@ class PayloadDiscoveryCompiler:
         root_mappings, dir_mappings = self._group_by_directory(self.file_mappings)
         
         # Convert to PayloadDiscoveryPiece objects
-        root_pieces = self._create_payload_pieces(root_mappings)
+        root_pieces, entry_piece = self._create_payload_pieces(root_mappings)
         
+        # Entry point is the lowest root sequence number, otherwise the lowest
+        # across all directories (tracked while building, no combined list)
         directory_pieces = {}
         for dir_name, mappings in dir_mappings.items():
-            directory_pieces[dir_name] = self._create_payload_pieces(mappings)
+            pieces, first_piece = self._create_payload_pieces(mappings)
+            directory_pieces[dir_name] = pieces
+            if not root_pieces and first_piece is not None and (
+                entry_piece is None or first_piece.sequence_number < entry_piece.sequence_number
+            ):
+                entry_piece = first_piece
         
-        # Determine entry point (lowest sequence number or README)
-        entry_point = "README.md"
-        if root_pieces:
-            entry_piece = min(root_pieces, key=lambda p: p.sequence_number)
-            entry_point = entry_piece.filename
-        elif directory_pieces:
-            # Find lowest sequence across all directories
-            all_pieces = []
-            for pieces in directory_pieces.values():
-                all_pieces.extend(pieces)
-            if all_pieces:
-                entry_piece = min(all_pieces, key=lambda p: p.sequence_number)
-                entry_point = entry_piece.filename
+        entry_point = entry_piece.filename if entry_piece is not None else "README.md"
         
         # Create PayloadDiscovery instance
         payload_discovery = PayloadDiscovery(
@@ -314,10 +371,12 @@ class PayloadDiscoveryCompiler:
             entry_point=entry_point
         )
         
-        # Validate
-        issues = payload_discovery.validate_sequence()
-        if issues:
-            logger.warning(f"Validation issues in compiled config: {issues}")
+        # Validate (issues are only reported as warnings, so skip the work
+        # when nobody would see them)
+        if config.validate and logger.isEnabledFor(logging.WARNING):
+            issues = payload_discovery.validate_sequence()
+            if issues:
+                logger.warning(f"Validation issues in compiled config: {issues}")
         
         logger.info(f"Successfully compiled {len(self.file_mappings)} files into PayloadDiscovery config")
         return payload_discovery
@@ -381,8 +440,6 @@ def compile_to_payload_discovery(
 
 
 if __name__ == "__main__":
-    import sys
-    
     if len(sys.argv) < 3:
         print("Usage: python compiler.py <source_dir> <output_config.json> [domain_name]")
         sys.exit(1)
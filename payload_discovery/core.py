@@ -2,16 +2,106 @@
 PayloadDiscovery Core - Models and functions for creating numbered instruction systems.
 """
 
+import itertools
 import json
 import os
+import shutil
+import sys
 from pathlib import Path
-from typing import Dict, List, Optional
-from pydantic import BaseModel, Field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from pydantic import BaseModel, Field, PrivateAttr
 from pydantic_stack_core import RenderablePiece
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Piece writes are I/O bound, so allow more threads than cores
+_WRITE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep __dict__
+# (hand-written __slots__ would clash with the field defaults)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Process-wide stamps for index builds; never reused, unlike id()
+_INDEX_GENERATIONS = itertools.count(1)
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode obj as indented JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+def _fifo_put(cache: Dict[Any, Any], key: Any, value: Any, maxsize: Optional[int]) -> None:
+    """Store key in cache as its newest entry, evicting the oldest beyond maxsize."""
+    cache.pop(key, None)
+    if maxsize is not None and len(cache) >= maxsize:
+        # Dicts keep insertion order, so the first key is the oldest
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+
+def _file_stamp(path: str) -> Tuple[int, int]:
+    """
+    Identify a file version by (mtime_ns, size).
+    
+    Size is part of the stamp since rewrites and appends can land within one
+    mtime tick. Raises FileNotFoundError if the file is missing.
+    """
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+class _StatCache:
+    """
+    Values derived from files, reused while the file's stamp is unchanged.
+    
+    Entries can never outlive a change to their file; maxsize optionally
+    bounds the cache with FIFO eviction.
+    """
+    
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize
+        self._entries: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+    
+    def get(self, path: str, stamp: Tuple[int, int]) -> Optional[Any]:
+        """Return the value cached for path if it was stored under stamp."""
+        cached = self._entries.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        return None
+    
+    def put(self, path: str, stamp: Tuple[int, int], value: Any) -> None:
+        """Cache value for path as of stamp."""
+        _fifo_put(self._entries, path, (stamp, value), self.maxsize)
+    
+    def discard(self, path: str) -> None:
+        """Forget path."""
+        self._entries.pop(path, None)
+    
+    def load(self, path: str, loader: Callable[[str], Any]) -> Any:
+        """Return loader(path), reusing the cached result while the file is unchanged."""
+        stamp = _file_stamp(path)
+        value = self.get(path, stamp)
+        if value is None:
+            value = loader(path)
+            self.put(path, stamp, value)
+        return value
+
 
 class PayloadDiscoveryPiece(BaseModel):
     """
@@ -36,10 +126,11 @@ class PayloadDiscoveryPiece(BaseModel):
     
     def render_to_file(self, directory: Path) -> Path:
         """Write this piece to a file in the given directory."""
-        filepath = directory / self.filename
-        filepath.write_text(self.content)
+        filepath = os.path.join(directory, self.filename)
+        with open(filepath, 'wb') as f:
+            f.write(self.content.encode('utf-8'))
         logger.debug(f"Wrote piece {self.sequence_number} to {filepath}")
-        return filepath
+        return Path(filepath)
 
 
 class PayloadDiscovery(RenderablePiece):
@@ -84,6 +175,100 @@ class PayloadDiscovery(RenderablePiece):
         description="Where agents should start reading"
     )
     
+    # Lookup indexes built once after validation, holding the pieces themselves.
+    # Pieces are treated as immutable after load; call _build_indexes() again
+    # if they are mutated.
+    _all_pieces: Tuple[PayloadDiscoveryPiece, ...] = PrivateAttr(default_factory=tuple)
+    _by_seq: Dict[int, PayloadDiscoveryPiece] = PrivateAttr(default_factory=dict)
+    _by_filename: Dict[str, PayloadDiscoveryPiece] = PrivateAttr(default_factory=dict)
+    _sorted_pieces: List[PayloadDiscoveryPiece] = PrivateAttr(default_factory=list)
+    _sorted_seq_numbers: List[int] = PrivateAttr(default_factory=list)
+    _total: int = PrivateAttr(default=0)
+    _index_generation: int = PrivateAttr(default=0)
+    _traversal_order: Tuple[PayloadDiscoveryPiece, ...] = PrivateAttr(default_factory=tuple)
+    
+    def model_post_init(self, __context: Any) -> None:
+        """Build lookup indexes once the model has been validated."""
+        self._build_indexes()
+    
+    def _build_indexes(self) -> None:
+        """
+        Index pieces by sequence number and filename (first occurrence wins),
+        and cache the derived collections used for navigation and validation.
+        """
+        by_seq: Dict[int, PayloadDiscoveryPiece] = {}
+        by_filename: Dict[str, PayloadDiscoveryPiece] = {}
+        
+        # Flattened root-then-directories view shared by all other lookups
+        all_pieces = tuple(self._iter_pieces())
+        for piece in all_pieces:
+            # Filenames repeat across loads of the same curriculum and serve
+            # as dict keys here and in the diary lookups, so share one copy
+            piece.filename = sys.intern(piece.filename)
+            by_seq.setdefault(piece.sequence_number, piece)
+            by_filename.setdefault(piece.filename, piece)
+        
+        self._all_pieces = all_pieces
+        self._by_seq = by_seq
+        self._by_filename = by_filename
+        self._sorted_pieces = sorted(self._all_pieces, key=lambda p: p.sequence_number)
+        self._sorted_seq_numbers = [p.sequence_number for p in self._sorted_pieces]
+        self._total = len(self._sorted_pieces)
+        self._index_generation = next(_INDEX_GENERATIONS)
+        
+        # PIS traversal: root files, then each directory in name order, each
+        # sorted by sequence number. Kept separate from the fields so saving
+        # the config doesn't reorder what the author wrote.
+        traversal = sorted(self.root_files, key=lambda p: p.sequence_number)
+        for dirname in sorted(self.directories):
+            traversal.extend(sorted(self.directories[dirname], key=lambda p: p.sequence_number))
+        self._traversal_order = tuple(traversal)
+    
+    # Read-only views over the indexes, for the MCP servers and PIS mapper
+    
+    @property
+    def index_generation(self) -> int:
+        """
+        Stamp of the current index build, unique across all discoveries.
+        
+        Changes whenever _build_indexes() runs, so caches derived from the
+        indexes can key on it to notice a rebuild.
+        """
+        return self._index_generation
+    
+    @property
+    def total_pieces(self) -> int:
+        """Number of pieces in the discovery."""
+        return self._total
+    
+    @property
+    def all_pieces(self) -> Sequence[PayloadDiscoveryPiece]:
+        """All pieces, root files first, then each directory in stored order."""
+        return self._all_pieces
+    
+    @property
+    def sorted_pieces(self) -> Sequence[PayloadDiscoveryPiece]:
+        """All pieces ordered by sequence number."""
+        return self._sorted_pieces
+    
+    @property
+    def sorted_sequence_numbers(self) -> Sequence[int]:
+        """All sequence numbers in ascending order (parallel to sorted_pieces)."""
+        return self._sorted_seq_numbers
+    
+    @property
+    def traversal_order(self) -> Sequence[PayloadDiscoveryPiece]:
+        """Pieces in PIS traversal order: sorted root files, then directories by name."""
+        return self._traversal_order
+    
+    def get_piece(self, sequence_number: int) -> Optional[PayloadDiscoveryPiece]:
+        """Look up a piece by sequence number (first occurrence wins)."""
+        return self._by_seq.get(sequence_number)
+    
+    def piece_for_filename(self, filename: str) -> Optional[PayloadDiscoveryPiece]:
+        """Look up a piece by filename (first occurrence wins)."""
+        return self._by_filename.get(filename)
+    
     def _render_header(self) -> List[str]:
         """Render header section."""
         lines = [f"# {self.domain} {self.version}"]
@@ -122,12 +307,14 @@ class PayloadDiscovery(RenderablePiece):
         logger.info(f"Rendering PayloadDiscovery to {base_dir}")
         return base_dir
     
-    def _write_directory_pieces(self, base_dir: Path, dirname: str, pieces: List[PayloadDiscoveryPiece]):
-        """Write pieces to a subdirectory."""
-        subdir = base_dir / dirname
-        subdir.mkdir(parents=True, exist_ok=True)
-        for piece in pieces:
-            piece.render_to_file(subdir)
+    def _collect_write_targets(self, base_dir: Path) -> List[Tuple[PayloadDiscoveryPiece, Path]]:
+        """Create all subdirectories and pair every piece with its target directory."""
+        targets = [(piece, base_dir) for piece in self.root_files]
+        for dirname, pieces in self.directories.items():
+            subdir = base_dir / dirname
+            subdir.mkdir(parents=True, exist_ok=True)
+            targets.extend((piece, subdir) for piece in pieces)
+        return targets
     
     def render_to_directory(self, base_path: str) -> Path:
         """
@@ -140,12 +327,11 @@ class PayloadDiscovery(RenderablePiece):
             Path to the created directory
         """
         base_dir = self._create_base_directory(base_path)
+        targets = self._collect_write_targets(base_dir)
         
-        for piece in self.root_files:
-            piece.render_to_file(base_dir)
-        
-        for dirname, pieces in self.directories.items():
-            self._write_directory_pieces(base_dir, dirname, pieces)
+        # Per-file open/write/close dominates large renders; overlap it across threads
+        with ThreadPoolExecutor(max_workers=_WRITE_WORKERS) as executor:
+            list(executor.map(lambda target: target[0].render_to_file(target[1]), targets))
         
         logger.info(f"Successfully rendered {len(self.root_files)} root files and {len(self.directories)} directories")
         return base_dir
@@ -154,6 +340,10 @@ class PayloadDiscovery(RenderablePiece):
         """Export to JSON string for editing by maker agents."""
         return self.model_dump_json(indent=indent)
     
+    def to_json_bytes(self, indent: int = 2) -> bytes:
+        """Export to UTF-8 JSON bytes (same output as to_json) without an intermediate str."""
+        return self.__pydantic_serializer__.to_json(self, indent=indent)
+    
     @classmethod
     def from_json(cls, json_path: str) -> "PayloadDiscovery":
         """
@@ -165,25 +355,22 @@ class PayloadDiscovery(RenderablePiece):
         Returns:
             PayloadDiscovery instance
         """
-        with open(json_path, 'r') as f:
-            data = json.load(f)
-        return cls(**data)
+        data = _json_loads(Path(json_path).read_bytes())
+        return cls.model_validate(data)
+    
+    def _iter_pieces(self) -> Iterator[PayloadDiscoveryPiece]:
+        """Iterate the current field contents: root files, then directories."""
+        return itertools.chain(self.root_files, *self.directories.values())
     
     def _get_all_filenames(self) -> List[str]:
         """Get all filenames from root and directories."""
-        all_files = [p.filename for p in self.root_files]
-        for pieces in self.directories.values():
-            all_files.extend([p.filename for p in pieces])
-        return all_files
+        return [p.filename for p in self._iter_pieces()]
     
-    def _get_all_sequence_numbers(self) -> set:
+    def _get_all_sequence_numbers(self) -> frozenset:
         """Get all sequence numbers from all pieces."""
-        all_numbers = {p.sequence_number for p in self.root_files}
-        for pieces in self.directories.values():
-            all_numbers.update(p.sequence_number for p in pieces)
-        return all_numbers
+        return frozenset(p.sequence_number for p in self._iter_pieces())
     
-    def _check_dependencies(self, pieces: List[PayloadDiscoveryPiece], all_numbers: set) -> List[str]:
+    def _check_dependencies(self, pieces: Iterable[PayloadDiscoveryPiece], all_numbers: frozenset) -> List[str]:
         """Check if dependencies reference valid sequence numbers."""
         issues = []
         for piece in pieces:
@@ -201,17 +388,20 @@ class PayloadDiscovery(RenderablePiece):
         """
         issues = []
         
-        # Check for duplicate filenames
-        all_files = self._get_all_filenames()
-        if len(all_files) != len(set(all_files)):
-            issues.append("Duplicate filenames detected")
+        # Read the fields rather than the load-time indexes: safe_write_config
+        # validates configs whose pieces may have been edited since load.
+        
+        # Check for duplicate filenames (stop at the first one)
+        seen = set()
+        for filename in self._get_all_filenames():
+            if filename in seen:
+                issues.append(f"Duplicate filename detected: {filename}")
+                break
+            seen.add(filename)
         
         # Check dependencies are valid
         all_numbers = self._get_all_sequence_numbers()
-        issues.extend(self._check_dependencies(self.root_files, all_numbers))
-        
-        for pieces in self.directories.values():
-            issues.extend(self._check_dependencies(pieces, all_numbers))
+        issues.extend(self._check_dependencies(self._iter_pieces(), all_numbers))
         
         return issues
 
@@ -226,8 +416,12 @@ def safe_write_config(
     
     This function:
     1. Validates the configuration
-    2. Creates a backup if file exists (optional)
-    3. Writes atomically to prevent corruption
+    2. Writes the new config to a temp file and fsyncs it
+    3. Hardlinks the existing file to a backup (optional)
+    4. Atomically replaces the config with the temp file
+    
+    The original file stays in place until the final replace, so a failed
+    write never leaves config_path missing.
     
     Args:
         payload_discovery: The PayloadDiscovery instance to save
@@ -247,17 +441,26 @@ def safe_write_config(
     if issues:
         logger.warning(f"Configuration has validation issues: {issues}")
     
-    # Backup existing file if requested
-    if backup and config_path.exists():
-        backup_path = config_path.with_suffix(f".backup_{os.getpid()}.json")
-        config_path.rename(backup_path)
-        logger.info(f"Created backup at {backup_path}")
-    
-    # Write atomically (write to temp, then rename)
+    # Write atomically (write + fsync temp, then replace)
     temp_path = config_path.with_suffix(f".tmp_{os.getpid()}.json")
     try:
-        temp_path.write_text(payload_discovery.to_json())
-        temp_path.rename(config_path)
+        with open(temp_path, 'wb') as f:
+            f.write(payload_discovery.to_json_bytes())
+            f.flush()
+            os.fsync(f.fileno())
+        
+        # Backup existing file if requested (link, so the original stays put)
+        if backup and config_path.exists():
+            backup_path = config_path.with_suffix(f".backup_{os.getpid()}.json")
+            backup_path.unlink(missing_ok=True)
+            try:
+                os.link(config_path, backup_path)
+            except OSError:
+                # Filesystem without hardlink support
+                shutil.copy2(config_path, backup_path)
+            logger.info(f"Created backup at {backup_path}")
+        
+        os.replace(temp_path, config_path)
         logger.info(f"Successfully wrote config to {config_path}")
     except Exception as e:
         # Clean up temp file if something went wrong
@@ -5,94 +5,174 @@ Maps PayloadDiscovery systems to PromptInjectionSystemVX1 and provides
 a state machine that can servo them based on DiscoveryReceipt.
 """
 
+import json
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Sequence, Set, Tuple, Union
 from pathlib import Path
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
-from .core import PayloadDiscovery, PayloadDiscoveryPiece
+from .core import PayloadDiscovery, PayloadDiscoveryPiece, _DATACLASS_SLOTS, _fifo_put
 
-logger = logging.getLogger(__name__)
-
-# Import HEAVEN PIS components
-try:
+if TYPE_CHECKING:
     from heaven_base.tool_utils.prompt_injection_system_vX1 import (
         PromptInjectionSystemVX1,
         PromptInjectionSystemConfigVX1,
-        PromptStepDefinitionVX1,
-        PromptBlockDefinitionVX1,
-        BlockTypeVX1
+        PromptStepDefinitionVX1
     )
     from heaven_base.baseheavenagent import HeavenAgentConfig
-except ImportError as e:
-    logger.warning(f"HEAVEN not available, using stubs: {e}", exc_info=True)
-    # Create stubs if HEAVEN not available for development
-    class BlockTypeVX1:
-        FREESTYLE = "freestyle"
-        REFERENCE = "reference"
-    
-    class PromptBlockDefinitionVX1(BaseModel):
-        type: str
-        content: str
-    
-    class PromptStepDefinitionVX1(BaseModel):
-        name: Optional[str] = None
-        blocks: List[PromptBlockDefinitionVX1]
-    
-    class HeavenAgentConfig(BaseModel):
-        system_prompt: str = ""
-        prompt_suffix_blocks: Optional[List[str]] = None
-    
-    class PromptInjectionSystemConfigVX1(BaseModel):
-        steps: List[PromptStepDefinitionVX1]
-        template_vars: Dict[str, Any]
-        agent_config: HeavenAgentConfig
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# HEAVEN PIS classes (or development stubs), resolved on first use so that
+# importing this module doesn't pay for HEAVEN's import chain or the stub models
+_SYMS: Dict[str, Any] = {}
+_SYMS_LOCK = threading.Lock()
+
+# Built PIS configs keyed by (discovery index generation, template_vars items),
+# so several agents servoing the same discovery share one config. A rebuild of
+# the discovery's indexes moves it to a new generation and a fresh entry.
+_CONFIG_CACHE: Dict[Tuple[int, frozenset], Any] = {}
+_CONFIG_CACHE_SIZE = 16
+# Mappers may be warmed from a background thread, so guard cache writes
+_CONFIG_CACHE_LOCK = threading.Lock()
+
+_PUBLIC_SYMS = {
+    "BlockTypeVX1": "BlockType",
+    "PromptBlockDefinitionVX1": "PromptBlock",
+    "PromptStepDefinitionVX1": "PromptStep",
+    "HeavenAgentConfig": "AgentConfig",
+    "PromptInjectionSystemConfigVX1": "PISConfig",
+    "PromptInjectionSystemVX1": "PIS",
+}
+
+
+def _load_pis_symbols() -> Dict[str, Any]:
+    """Import the HEAVEN PIS components once, falling back to stubs."""
+    if _SYMS:
+        return _SYMS
     
-    class PromptInjectionSystemVX1:
-        def __init__(self, config: PromptInjectionSystemConfigVX1):
-            self.config = config
-            self.current_step_index = 0
+    # Mappers can be created on the warm-up thread and a request thread at
+    # once; only one of them should run the import and build the stubs
+    with _SYMS_LOCK:
+        if not _SYMS:
+            _import_pis_symbols()
+    return _SYMS
+
+
+def _import_pis_symbols() -> None:
+    """Resolve the HEAVEN PIS components (or stubs) into _SYMS; caller holds _SYMS_LOCK."""
+    try:
+        from heaven_base.tool_utils.prompt_injection_system_vX1 import (
+            PromptInjectionSystemVX1,
+            PromptInjectionSystemConfigVX1,
+            PromptStepDefinitionVX1,
+            PromptBlockDefinitionVX1,
+            BlockTypeVX1
+        )
+        from heaven_base.baseheavenagent import HeavenAgentConfig
+    except ImportError as e:
+        logger.warning(f"HEAVEN not available, using stubs: {e}", exc_info=True)
+        # Create stubs if HEAVEN not available for development
+        class BlockTypeVX1:
+            FREESTYLE = "freestyle"
+            REFERENCE = "reference"
+        
+        class PromptBlockDefinitionVX1(BaseModel):
+            type: str
+            content: str
+        
+        class PromptStepDefinitionVX1(BaseModel):
+            name: Optional[str] = None
+            blocks: List[PromptBlockDefinitionVX1]
         
-        def get_next_prompt(self) -> Optional[str]:
-            if self.current_step_index >= len(self.config.steps):
-                return None
-            step = self.config.steps[self.current_step_index]
-            self.current_step_index += 1
-            return "".join([b.content for b in step.blocks])
+        class HeavenAgentConfig(BaseModel):
+            system_prompt: str = ""
+            prompt_suffix_blocks: Optional[List[str]] = None
         
-        def has_next_prompt(self) -> bool:
-            return self.current_step_index < len(self.config.steps)
+        class PromptInjectionSystemConfigVX1(BaseModel):
+            steps: List[PromptStepDefinitionVX1]
+            template_vars: Dict[str, Any]
+            agent_config: HeavenAgentConfig
         
-        def reset_sequence(self):
-            self.current_step_index = 0
+        class PromptInjectionSystemVX1:
+            def __init__(self, config: PromptInjectionSystemConfigVX1):
+                self.config = config
+                self.current_step_index = 0
+            
+            def get_next_prompt(self) -> Optional[str]:
+                if self.current_step_index >= len(self.config.steps):
+                    return None
+                step = self.config.steps[self.current_step_index]
+                self.current_step_index += 1
+                return "".join([b.content for b in step.blocks])
+            
+            def has_next_prompt(self) -> bool:
+                return self.current_step_index < len(self.config.steps)
+            
+            def reset_sequence(self):
+                self.current_step_index = 0
+    
+    symbols = dict(
+        BlockType=BlockTypeVX1,
+        PromptBlock=PromptBlockDefinitionVX1,
+        PromptStep=PromptStepDefinitionVX1,
+        AgentConfig=HeavenAgentConfig,
+        PISConfig=PromptInjectionSystemConfigVX1,
+        PIS=PromptInjectionSystemVX1
+    )
+    # Publish the real names too, so string annotations resolve at runtime
+    # (e.g. typing.get_type_hints) once the classes are loaded
+    globals().update({public: symbols[key] for public, key in _PUBLIC_SYMS.items()})
+    # Filled last, so the unlocked check in _load_pis_symbols never sees a partial set
+    _SYMS.update(symbols)
+
+
+def __getattr__(name: str):
+    """Keep the HEAVEN class names importable from this module now that they load lazily."""
+    if name in _PUBLIC_SYMS:
+        return _load_pis_symbols()[_PUBLIC_SYMS[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _construct(model_cls, **fields):
+    """
+    Build a model from trusted, internally produced data without validation.
+    
+    Uses model_construct on pydantic v2 models and construct on v1 models,
+    since the HEAVEN classes may come from either.
+    """
+    construct = getattr(model_cls, "model_construct", None) or model_cls.construct
+    return construct(**fields)
 
 
-class DiscoveryReceipt(BaseModel):
+@dataclass(**_DATACLASS_SLOTS)
+class DiscoveryReceipt:
     """
     Tracks agent progress through a PayloadDiscovery system.
     
     The receipt records which pieces have been consumed and allows
-    the state machine to resume from where it left off.
+    the state machine to resume from where it left off. It is internal
+    progress state, so it is a plain slotted dataclass rather than a
+    validated model; use to_dict/from_dict (or the JSON variants) to persist it.
     """
     
-    domain: str = Field(..., description="Domain of the PayloadDiscovery system")
-    version: str = Field(..., description="Version of the PayloadDiscovery system")
-    completed_pieces: List[int] = Field(
-        default_factory=list,
-        description="Sequence numbers of completed pieces"
-    )
-    current_directory: Optional[str] = Field(
-        default=None,
-        description="Current directory being processed"
-    )
-    current_piece_index: int = Field(
-        default=0,
-        description="Index of current piece in current directory"
-    )
-    total_pieces: int = Field(
-        default=0,
-        description="Total number of pieces in the system"
-    )
+    domain: str  # Domain of the PayloadDiscovery system
+    version: str  # Version of the PayloadDiscovery system
+    completed_pieces: Set[int] = field(default_factory=set)  # Sequence numbers of completed pieces
+    current_directory: Optional[str] = None  # Current directory being processed
+    current_piece_index: int = 0  # Index of current piece in current directory
+    total_pieces: int = 0  # Total number of pieces in the system
+    
+    def __post_init__(self):
+        """Accept any iterable of sequence numbers (callers often pass a list)."""
+        self.completed_pieces = set(self.completed_pieces)
     
     def is_complete(self) -> bool:
         """Check if all pieces have been consumed."""
@@ -100,14 +180,52 @@ class DiscoveryReceipt(BaseModel):
     
     def mark_piece_complete(self, sequence_number: int):
         """Mark a piece as completed."""
-        if sequence_number not in self.completed_pieces:
-            self.completed_pieces.append(sequence_number)
+        self.completed_pieces.add(sequence_number)
     
     def get_completion_percentage(self) -> float:
         """Get percentage of pieces completed."""
         if self.total_pieces == 0:
             return 0.0
         return (len(self.completed_pieces) / self.total_pieces) * 100
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-ready dict; completed pieces are written as a sorted list."""
+        data = asdict(self)
+        data["completed_pieces"] = sorted(self.completed_pieces)
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DiscoveryReceipt":
+        """Create a receipt from a dict produced by to_dict."""
+        return cls(
+            domain=data["domain"],
+            version=data["version"],
+            completed_pieces=data.get("completed_pieces", ()),
+            current_directory=data.get("current_directory"),
+            current_piece_index=data.get("current_piece_index", 0),
+            total_pieces=data.get("total_pieces", 0)
+        )
+    
+    def to_json(self) -> str:
+        """Serialize to a JSON string."""
+        return json.dumps(self.to_dict())
+    
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> "DiscoveryReceipt":
+        """Load a receipt from JSON produced by to_json or to_wire."""
+        if orjson is not None:
+            return cls.from_dict(orjson.loads(data))
+        return cls.from_dict(json.loads(data))
+    
+    def to_wire(self) -> bytes:
+        """
+        Serialize to compact JSON bytes for persistence.
+        
+        Uses orjson when installed; read back with from_json.
+        """
+        if orjson is not None:
+            return orjson.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), separators=(",", ":")).encode("utf-8")
 
 
 class PayloadDiscoveryPISMapper:
@@ -120,46 +238,54 @@ class PayloadDiscoveryPISMapper:
     
     def __init__(self, payload_discovery: PayloadDiscovery):
         self.payload_discovery = payload_discovery
+        _load_pis_symbols()
+        # Steps are never mutated once built, so every PIS created by this
+        # mapper shares them. Stored with the traversal tuple they were built
+        # from; holding that tuple keeps the identity check valid, and an
+        # index rebuild replaces it, which forces a rebuild here too.
+        self._steps: Optional[Tuple[Sequence[PayloadDiscoveryPiece], Tuple["PromptStepDefinitionVX1", ...]]] = None
         logger.debug(f"Initialized mapper for {payload_discovery.domain} {payload_discovery.version}")
     
-    def _piece_to_prompt_step(self, piece: PayloadDiscoveryPiece) -> PromptStepDefinitionVX1:
-        """Convert a PayloadDiscoveryPiece to a PromptStepDefinition."""
-        # Create a FREESTYLE block with the piece content
-        block = PromptBlockDefinitionVX1(
-            type=BlockTypeVX1.FREESTYLE,
+    def _piece_to_prompt_step(self, piece: PayloadDiscoveryPiece) -> "PromptStepDefinitionVX1":
+        """Convert a piece to a PromptStepDefinition."""
+        # Create a FREESTYLE block with the piece content. Both come from an
+        # already validated PayloadDiscovery, so skip re-validation.
+        block = _construct(
+            _SYMS["PromptBlock"],
+            type=_SYMS["BlockType"].FREESTYLE,
             content=piece.content
         )
         
         # Create step with name from piece title
-        return PromptStepDefinitionVX1(
+        step = _construct(
+            _SYMS["PromptStep"],
             name=f"{piece.filename}: {piece.title}",
             blocks=[block]
         )
+        return step
     
-    def _get_ordered_pieces(self) -> List[PayloadDiscoveryPiece]:
-        """Get all pieces in traversal order."""
-        ordered_pieces = []
-        
-        # Add root files first (usually README, ARCHITECTURE)
-        ordered_pieces.extend(
-            sorted(self.payload_discovery.root_files, 
-                   key=lambda p: p.sequence_number)
-        )
-        
-        # Add directory pieces in directory order
-        for dirname in sorted(self.payload_discovery.directories.keys()):
-            pieces = self.payload_discovery.directories[dirname]
-            ordered_pieces.extend(
-                sorted(pieces, key=lambda p: p.sequence_number)
-            )
+    def _prompt_steps(self) -> Tuple["PromptStepDefinitionVX1", ...]:
+        """Prompt steps for the current traversal order, built once per index build."""
+        ordered_pieces = self.ordered_pieces
+        if self._steps is None or self._steps[0] is not ordered_pieces:
+            self._steps = (ordered_pieces, tuple(map(self._piece_to_prompt_step, ordered_pieces)))
+        return self._steps[1]
+    
+    @property
+    def ordered_pieces(self) -> Sequence[PayloadDiscoveryPiece]:
+        """
+        All pieces in traversal order.
         
-        return ordered_pieces
+        This is the discovery's own immutable tuple, sorted once at load,
+        so it is shared rather than copied.
+        """
+        return self.payload_discovery.traversal_order
     
     def to_pis_config(
         self,
         template_vars: Optional[Dict[str, Any]] = None,
-        agent_config: Optional[HeavenAgentConfig] = None
-    ) -> PromptInjectionSystemConfigVX1:
+        agent_config: Optional["HeavenAgentConfig"] = None
+    ) -> "PromptInjectionSystemConfigVX1":
         """
         Convert PayloadDiscovery to PromptInjectionSystemConfigVX1.
         
@@ -170,24 +296,50 @@ class PayloadDiscoveryPISMapper:
         Returns:
             PromptInjectionSystemConfigVX1 ready for PIS consumption
         """
-        # Get all pieces in order
-        ordered_pieces = self._get_ordered_pieces()
+        # Only default-agent configs with hashable template vars are shared
+        cache_key = None
+        if agent_config is None:
+            try:
+                cache_key = (self.payload_discovery.index_generation, frozenset((template_vars or {}).items()))
+            except TypeError:
+                cache_key = None
+        
+        if cache_key is not None:
+            cached = _CONFIG_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
         
-        # Convert each piece to a prompt step
-        steps = [self._piece_to_prompt_step(piece) for piece in ordered_pieces]
+        # Convert each piece, in traversal order, to a prompt step
+        steps = list(self._prompt_steps())
         
         # Create PIS config
-        return PromptInjectionSystemConfigVX1(
+        config = _SYMS["PISConfig"](
             steps=steps,
-            template_vars=template_vars or {},
-            agent_config=agent_config or HeavenAgentConfig()
+            # Copied so later edits to the caller's dict can't leak into a shared config
+            template_vars=dict(template_vars or {}),
+            agent_config=agent_config or _SYMS["AgentConfig"]()
         )
+        
+        if cache_key is not None:
+            with _CONFIG_CACHE_LOCK:
+                _fifo_put(_CONFIG_CACHE, cache_key, config, _CONFIG_CACHE_SIZE)
+        return config
+    
+    def warm(self) -> None:
+        """
+        Build the default PIS config into the shared config cache now.
+        
+        The cache outlives this mapper, so the state machines created per
+        request pick the config up. Idempotent; meant to run in the
+        background right after a discovery is loaded.
+        """
+        self.to_pis_config()
     
     def create_pis(
         self,
         template_vars: Optional[Dict[str, Any]] = None,
-        agent_config: Optional[HeavenAgentConfig] = None
-    ) -> PromptInjectionSystemVX1:
+        agent_config: Optional["HeavenAgentConfig"] = None
+    ) -> "PromptInjectionSystemVX1":
         """
         Create a PromptInjectionSystemVX1 from the PayloadDiscovery.
         
@@ -195,7 +347,7 @@ class PayloadDiscoveryPISMapper:
             PromptInjectionSystemVX1 ready to servo prompts
         """
         config = self.to_pis_config(template_vars, agent_config)
-        return PromptInjectionSystemVX1(config)
+        return _SYMS["PIS"](config)
 
 
 class PayloadDiscoveryStateMachine:
@@ -210,17 +362,16 @@ class PayloadDiscoveryStateMachine:
         payload_discovery: PayloadDiscovery,
         receipt: Optional[DiscoveryReceipt] = None,
         template_vars: Optional[Dict[str, Any]] = None,
-        agent_config: Optional[HeavenAgentConfig] = None
+        agent_config: Optional["HeavenAgentConfig"] = None
     ):
         self.payload_discovery = payload_discovery
         self.mapper = PayloadDiscoveryPISMapper(payload_discovery)
+        # Position -> sequence number, used to record each served prompt
+        self._sequence_numbers = tuple(p.sequence_number for p in self.mapper.ordered_pieces)
         
         # Initialize or use provided receipt
         if receipt is None:
-            # Count total pieces
-            total = len(payload_discovery.root_files)
-            for pieces in payload_discovery.directories.values():
-                total += len(pieces)
+            total = payload_discovery.total_pieces
             
             self.receipt = DiscoveryReceipt(
                 domain=payload_discovery.domain,
@@ -239,12 +390,19 @@ class PayloadDiscoveryStateMachine:
         logger.info(f"Initialized state machine at {self.receipt.get_completion_percentage():.1f}% complete")
     
     def _sync_pis_to_receipt(self):
-        """Sync PIS position to match receipt state."""
-        # Reset PIS to beginning
-        self.pis.reset_sequence()
-        
-        # Fast-forward through completed pieces
+        """Sync PIS position (and the state machine's cursor) to match receipt state."""
         completed_count = len(self.receipt.completed_pieces)
+        # Position of the next prompt, advanced alongside the PIS
+        self._cursor = completed_count
+        
+        # Jump straight to the position when the PIS exposes its step index;
+        # one step is generated per ordered piece
+        if hasattr(self.pis, "current_step_index"):
+            self.pis.current_step_index = min(completed_count, len(self._sequence_numbers))
+            return
+        
+        # Otherwise reset to the beginning and fast-forward through completed pieces
+        self.pis.reset_sequence()
         for _ in range(completed_count):
             if self.pis.has_next_prompt():
                 self.pis.get_next_prompt()
@@ -263,12 +421,11 @@ class PayloadDiscoveryStateMachine:
         if prompt:
             # Mark the piece as complete
             # Note: We're tracking by position, need to map back to sequence number
-            ordered_pieces = self.mapper._get_ordered_pieces()
-            current_index = len(self.receipt.completed_pieces)
-            if current_index < len(ordered_pieces):
-                piece = ordered_pieces[current_index]
-                self.receipt.mark_piece_complete(piece.sequence_number)
-                logger.debug(f"Completed piece {piece.sequence_number}: {piece.filename}")
+            if self._cursor < len(self._sequence_numbers):
+                seq = self._sequence_numbers[self._cursor]
+                self._cursor += 1
+                self.receipt.mark_piece_complete(seq)
+                logger.debug(f"Completed piece {seq}")
         
         return prompt
     
@@ -284,6 +441,7 @@ class PayloadDiscoveryStateMachine:
             total_pieces=self.receipt.total_pieces
         )
         self.pis.reset_sequence()
+        self._cursor = 0
     
     def get_receipt(self) -> DiscoveryReceipt:
         """Get current receipt for persistence."""
@@ -6,62 +6,117 @@ while tracking progress in STARLOG's debug diary.
 """
 
 import logging
-import json
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-try:
-    from mcp.server.fastmcp import FastMCP
-except ImportError:
-    logger.error("FastMCP not available - install mcp package")
-    raise
-
-from .core import PayloadDiscovery, load_payload_discovery
-from .heaven_pis_integration import PayloadDiscoveryStateMachine, DiscoveryReceipt
-
-# Import STARLOG for diary integration
-try:
-    from starlog_mcp.starlog import Starlog
-    from starlog_mcp.models import DebugDiaryEntry
-    STARLOG_AVAILABLE = True
-except ImportError as e:
-    logger.warning("STARLOG not available - diary tracking disabled", exc_info=True)
-    STARLOG_AVAILABLE = False
-    
-    # Stub for development
-    class DebugDiaryEntry:
-        def __init__(self, content: str, **kwargs):
-            self.content = content
+from .core import PayloadDiscovery, load_payload_discovery, _json_loads, _StatCache
+from .heaven_pis_integration import (
+    PayloadDiscoveryPISMapper,
+    PayloadDiscoveryStateMachine,
+    DiscoveryReceipt
+)
+from .mcp_tool import rebuild_receipts
 
-# Create FastMCP app
-app = FastMCP("PayloadDiscovery")
-logger.info("Created PayloadDiscovery FastMCP application")
+# FastMCP app and STARLOG classes are imported on first use so that importing
+# the package (e.g. only for the compiler) doesn't pay for the MCP stack
+_app = None
+_starlog_classes: Optional[Tuple[Any, Any]] = None
+_starlog_checked = False
+_starlog_instance = None
+_project_name_cache: Dict[str, str] = {}
 
 # Cache for active discovery systems
 _active_discoveries: Dict[str, PayloadDiscovery] = {}
 
+# Parsed debug diary files, keyed on file stat
+_diary_cache = _StatCache()
 
-def _get_diary_tag(domain: str, version: str) -> str:
-    """Get the tag prefix for debug diary entries."""
-    return f"[PayloadDiscovery:{domain}:{version}]"
+# Single background worker that prebuilds PIS configs for started discoveries,
+# created on first use like the FastMCP app
+_warm_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_starlog_classes() -> Optional[Tuple[Any, Any]]:
+    """Import STARLOG once; returns (Starlog, DebugDiaryEntry) or None if unavailable."""
+    global _starlog_classes, _starlog_checked
+    if not _starlog_checked:
+        _starlog_checked = True
+        try:
+            from starlog_mcp.starlog import Starlog
+            from starlog_mcp.models import DebugDiaryEntry
+            _starlog_classes = (Starlog, DebugDiaryEntry)
+        except ImportError:
+            logger.warning("STARLOG not available - diary tracking disabled", exc_info=True)
+    return _starlog_classes
 
 
-def _parse_diary_entries(starlog_path: str, domain: str, version: str) -> List[str]:
+def _get_warm_executor() -> ThreadPoolExecutor:
+    """Get the shared background warm-up executor."""
+    global _warm_executor
+    if _warm_executor is None:
+        _warm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="payload-discovery-warm")
+    return _warm_executor
+
+
+def _warm_discovery(pd: PayloadDiscovery) -> None:
     """
-    Parse debug diary to find completed pieces.
+    Build the default PIS config for pd off the request thread.
     
-    Returns list of completed piece filenames.
+    Only process-wide state is warmed: the HEAVEN import and the shared
+    config cache entry that the per-call state machines hit. The mapper
+    itself is discarded.
     """
-    if not STARLOG_AVAILABLE:
+    PayloadDiscoveryPISMapper(pd).warm()
+
+
+def _log_warm_failure(future: Future) -> None:
+    """Report a failed warm-up; the next prompt request just builds the config itself."""
+    error = future.exception()
+    if error is not None:
+        logger.warning(f"Background warm-up failed: {error}", exc_info=error)
+
+
+def _get_starlog() -> Any:
+    """Get the shared Starlog instance (STARLOG must be available)."""
+    global _starlog_instance
+    if _starlog_instance is None:
+        _starlog_instance = _get_starlog_classes()[0]()
+    return _starlog_instance
+
+
+def _get_project_name(starlog: Any, starlog_path: str) -> str:
+    """Resolve a STARLOG project name from its path, memoized per path."""
+    project_name = _project_name_cache.get(starlog_path)
+    if project_name is None:
+        project_name = starlog._get_project_name_from_path(starlog_path)
+        _project_name_cache[starlog_path] = project_name
+    return project_name
+
+
+def _load_diary_file(diary_file: Path) -> List[Dict[str, Any]]:
+    """Load diary entries, reusing the parsed list while the file is unchanged."""
+    return _diary_cache.load(str(diary_file), lambda path: _json_loads(Path(path).read_bytes()))
+
+
+def _get_diary_tag(domain: str, version: str) -> str:
+    """Get the tag prefix for debug diary entries."""
+    return f"[PayloadDiscovery:{domain}:{version}]"
+
+
+def _read_diary_entries(starlog_path: str) -> List[Dict[str, Any]]:
+    """Read the project's debug diary entries (empty if STARLOG or the diary is missing)."""
+    starlog_classes = _get_starlog_classes()
+    if starlog_classes is None:
         return []
     
     try:
-        starlog = Starlog()
-        project_name = starlog._get_project_name_from_path(starlog_path)
+        starlog = _get_starlog()
+        project_name = _get_project_name(starlog, starlog_path)
         
         # Get debug diary entries
         registry_path = Path(starlog._get_registry_path(project_name))
@@ -70,36 +125,24 @@ def _parse_diary_entries(starlog_path: str, domain: str, version: str) -> List[s
         if not diary_file.exists():
             return []
         
-        with open(diary_file, 'r') as f:
-            entries = json.load(f)
-        
-        # Parse for our tag
-        tag = _get_diary_tag(domain, version)
-        completed = []
-        
-        for entry in entries:
-            content = entry.get('content', '')
-            if tag in content and 'Completed:' in content:
-                # Extract filename from "Completed: 00_Overview.md (1/32 pieces, 3.1%)"
-                parts = content.split('Completed:')[1].split('(')[0].strip()
-                completed.append(parts)
-        
-        return completed
+        return _load_diary_file(diary_file)
         
     except Exception as e:
-        logger.error(f"Error parsing diary entries: {e}")
+        logger.error(f"Error reading diary entries: {e}")
         return []
 
 
 def _write_diary_entry(starlog_path: str, content: str, insights: Optional[str] = None):
     """Write an entry to the debug diary."""
-    if not STARLOG_AVAILABLE:
+    starlog_classes = _get_starlog_classes()
+    if starlog_classes is None:
         logger.info(f"STARLOG not available - would write: {content}")
         return
     
     try:
-        starlog = Starlog()
-        project_name = starlog._get_project_name_from_path(starlog_path)
+        DebugDiaryEntry = starlog_classes[1]
+        starlog = _get_starlog()
+        project_name = _get_project_name(starlog, starlog_path)
         
         entry = DebugDiaryEntry(
             content=content,
@@ -119,40 +162,13 @@ def _reconstruct_state(starlog_path: str, pd: PayloadDiscovery) -> DiscoveryRece
     
     This is the key function that makes the system stateless!
     """
-    completed_filenames = _parse_diary_entries(starlog_path, pd.domain, pd.version)
-    
-    # Map filenames back to sequence numbers
-    completed_numbers = []
-    
-    # Check root files
-    for piece in pd.root_files:
-        if piece.filename in completed_filenames:
-            completed_numbers.append(piece.sequence_number)
+    key = (pd.domain, pd.version)
+    receipt = rebuild_receipts(_read_diary_entries(starlog_path), {key: pd})[key]
     
-    # Check directory files
-    for pieces in pd.directories.values():
-        for piece in pieces:
-            if piece.filename in completed_filenames:
-                completed_numbers.append(piece.sequence_number)
-    
-    # Count total pieces
-    total = len(pd.root_files)
-    for pieces in pd.directories.values():
-        total += len(pieces)
-    
-    # Create receipt
-    receipt = DiscoveryReceipt(
-        domain=pd.domain,
-        version=pd.version,
-        completed_pieces=completed_numbers,
-        total_pieces=total
-    )
-    
-    logger.debug(f"Reconstructed state: {len(completed_numbers)}/{total} pieces complete")
+    logger.debug(f"Reconstructed state: {len(receipt.completed_pieces)}/{receipt.total_pieces} pieces complete")
     return receipt
 
 
-@app.tool()
 def start_payload_discovery(
     config_path: str,
     starlog_path: str,
@@ -181,12 +197,15 @@ def start_payload_discovery(
         # Cache it
         _active_discoveries[starlog_path] = pd
         
+        # Build the PIS config in the background so the first prompt is fast
+        _get_warm_executor().submit(_warm_discovery, pd).add_done_callback(_log_warm_failure)
+        
         # Write initial diary entry
         tag = _get_diary_tag(pd.domain, pd.version)
         _write_diary_entry(
             starlog_path,
             f"{tag} Started discovery system",
-            f"Rendered to {output_dir}, Total pieces: {pd.root_files + sum(len(p) for p in pd.directories.values())}"
+            f"Rendered to {output_dir}, Total pieces: {pd.total_pieces}"
         )
         
         return f"✅ Started PayloadDiscovery: {pd.domain} {pd.version}\nRendered to: {output_dir}\nTracking in: {starlog_path}"
@@ -196,7 +215,6 @@ def start_payload_discovery(
         return f"❌ Error: {str(e)}"
 
 
-@app.tool()
 def get_next_discovery_prompt(starlog_path: str) -> str:
     """
     Get next prompt in the discovery sequence.
@@ -237,30 +255,20 @@ def get_next_discovery_prompt(starlog_path: str) -> str:
             )
             return ""  # Complete
         
+        # Snapshot before serving: the machine updates this same receipt in place
+        previously_completed = set(receipt.completed_pieces)
         prompt = machine.get_next_prompt()
         
         if prompt:
             # Figure out which piece we just served
-            # (The machine updated its receipt)
             new_receipt = machine.get_receipt()
-            newly_completed = set(new_receipt.completed_pieces) - set(receipt.completed_pieces)
+            newly_completed = set(new_receipt.completed_pieces) - previously_completed
             
             if newly_completed:
                 # Find the piece details
-                piece_num = list(newly_completed)[0]
-                piece_name = None
-                
-                for p in pd.root_files:
-                    if p.sequence_number == piece_num:
-                        piece_name = p.filename
-                        break
-                
-                if not piece_name:
-                    for pieces in pd.directories.values():
-                        for p in pieces:
-                            if p.sequence_number == piece_num:
-                                piece_name = p.filename
-                                break
+                piece_num = next(iter(newly_completed))
+                piece = pd.get_piece(piece_num)
+                piece_name = piece.filename if piece else None
                 
                 # Write diary entry
                 completed_count = len(new_receipt.completed_pieces)
@@ -279,7 +287,6 @@ def get_next_discovery_prompt(starlog_path: str) -> str:
         return f"❌ Error: {str(e)}"
 
 
-@app.tool()
 def get_discovery_progress(starlog_path: str) -> str:
     """
     Get current progress through discovery system.
@@ -314,7 +321,6 @@ def get_discovery_progress(starlog_path: str) -> str:
         return f"❌ Error: {str(e)}"
 
 
-@app.tool()
 def reset_discovery(starlog_path: str) -> str:
     """
     Reset discovery progress to beginning.
@@ -349,10 +355,34 @@ def reset_discovery(starlog_path: str) -> str:
         return f"❌ Error: {str(e)}"
 
 
+def _get_app():
+    """Create the FastMCP app on first use and register the discovery tools."""
+    global _app
+    if _app is None:
+        try:
+            from mcp.server.fastmcp import FastMCP
+        except ImportError:
+            logger.error("FastMCP not available - install mcp package")
+            raise
+        
+        _app = FastMCP("PayloadDiscovery")
+        for tool in (start_payload_discovery, get_next_discovery_prompt, get_discovery_progress, reset_discovery):
+            _app.tool()(tool)
+        logger.info("Created PayloadDiscovery FastMCP application")
+    return _app
+
+
+def __getattr__(name: str):
+    """Keep `mcp_server.app` working now that the app is created lazily."""
+    if name == "app":
+        return _get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def main():
     """Main entry point for console script."""
     logger.info("Starting PayloadDiscovery MCP server")
-    app.run()
+    _get_app().run()
 
 
 if __name__ == "__main__":
@@ -4,72 +4,137 @@ Waypoint MCP Server - Agent navigation system for structured learning journeys.
 Agents traverse waypoints in a curriculum, logging their progress like a starship captain.
 """
 
+import bisect
 import logging
 import json
 import os
+import re
 import uuid
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Filename in "🧭 @waypoint:domain:version(filename.md) ..."
+_WAYPOINT_RE = re.compile(r'🧭 @waypoint:[^(]*\(([^)]+)\)')
+# Progress in "Completed step X/Y - filename served"
+_STEP_RE = re.compile(r'Completed step (\d+)/(\d+)')
+
 try:
     from mcp.server.fastmcp import FastMCP
 except ImportError as e:
     logger.error("FastMCP not available - install mcp package", exc_info=True)
     raise
 
-from .core import PayloadDiscovery, load_payload_discovery
-
-# Import STARLOG for flight config registry access
-from starlog_mcp.starlog import Starlog
-from starlog_mcp.models import DebugDiaryEntry, StarlogPayloadDiscoveryConfig
+from .core import PayloadDiscovery, load_payload_discovery, _json_dumps, _json_loads, _StatCache, _file_stamp
 
 app = FastMCP("Waypoint")
 logger.info("Created Waypoint FastMCP application")
 
-# No in-memory state - everything uses persistent JSON files
+# No in-memory state - everything uses persistent JSON files. The only
+# caches below are keyed on file stat, so they never outlive a file change.
+
+# Loaded configs by absolute path, bounded since servers see many configs
+_PD_CACHE_SIZE = 16
+_pd_cache = _StatCache(maxsize=_PD_CACHE_SIZE)
+
+# STARLOG is only needed to resolve flight config registry keys, so it is
+# imported on first use rather than at server start-up
+_starlog_instance = None
+
+# Diary registries as last written by us
+_registry_cache = _StatCache()
+_heaven_data_dir_warned = False
+
+# Completed filenames parsed from waypoint temp files
+_diary_cache = _StatCache()
 
 
-def _load_payload_discovery_from_state(starlog_path: str) -> Optional[PayloadDiscovery]:
+def _get_starlog():
+    """Get the shared Starlog instance, importing STARLOG on first use."""
+    global _starlog_instance
+    if _starlog_instance is None:
+        from starlog_mcp.starlog import Starlog
+        _starlog_instance = Starlog()
+    return _starlog_instance
+
+
+def _load_payload_discovery_cached(config_path: str) -> PayloadDiscovery:
+    """Load a PayloadDiscovery config, reusing the parsed model while the file is unchanged."""
+    return _pd_cache.load(os.path.abspath(config_path), load_payload_discovery)
+
+
+@dataclass
+class WaypointContext:
+    """
+    Per-invocation view of a journey.
+    
+    Tool entry points build one context and pass it down, so the journey's
+    JSON state is read once per call instead of once per helper.
+    """
+    project_name: Optional[str]
+    state_data: dict
+    
+    @classmethod
+    def load(cls, starlog_path: str) -> "WaypointContext":
+        """Resolve the project name and read the journey state for starlog_path."""
+        project_name = Path(starlog_path).name if starlog_path else None
+        state_data = _read_temp_json(project_name) if starlog_path else {}
+        return cls(project_name=project_name, state_data=state_data)
+    
+    @property
+    def is_active(self) -> bool:
+        """Whether there is an unfinished journey for this path."""
+        return bool(self.state_data) and self.state_data.get("status") != "END"
+    
+    @property
+    def config_path(self) -> Optional[str]:
+        """Config path (or registry key) recorded for the journey, if any."""
+        return self.state_data.get("config_path") if self.state_data else None
+    
+    @property
+    def state_file(self) -> str:
+        """Temp JSON file holding the journey state (as read by _read_temp_json)."""
+        if self.project_name:
+            return f"/tmp/waypoint_state_{self.project_name}.json"
+        return "/tmp/waypoint_state.json"
+
+
+def _load_payload_discovery_from_state(starlog_path: str, ctx: Optional[WaypointContext] = None) -> Optional[PayloadDiscovery]:
     """Load PayloadDiscovery from config file based on JSON state."""
-    if not starlog_path:
-        return None
-        
-    project_name = Path(starlog_path).name
-    state_data = _read_temp_json(project_name)
+    if ctx is None:
+        ctx = WaypointContext.load(starlog_path)
     
-    if not state_data or state_data.get("status") == "END":
+    if not ctx.is_active:
         return None
     
     # Get config path from state data
-    config_path = state_data.get("config_path")
+    config_path = ctx.config_path
     if not config_path:
         # Fallback for old state format
-        workflow = state_data.get("workflow", "starlog_flight")
+        workflow = ctx.state_data.get("workflow", "starlog_flight")
         config_path = f"{starlog_path}/{workflow}.json"
     
     try:
         # Use the registry resolver to handle both file paths and registry keys
         resolved_path = _resolve_config_path_or_key(config_path)
-        return load_payload_discovery(resolved_path)
+        return _load_payload_discovery_cached(resolved_path)
     except Exception as e:
         logger.error(f"Failed to load PayloadDiscovery from {config_path}: {e}", exc_info=True)
         return None
 
 
-def _get_active_journey_info(starlog_path: str) -> Optional[dict]:
+def _get_active_journey_info(starlog_path: str, ctx: Optional[WaypointContext] = None) -> Optional[dict]:
     """Get info about active journey for a starlog path, if any."""
-    if not starlog_path:
-        return None
-        
-    project_name = Path(starlog_path).name
-    state_data = _read_temp_json(project_name)
+    if ctx is None:
+        ctx = WaypointContext.load(starlog_path)
     
-    if not state_data or state_data.get("status") == "END":
+    if not ctx.is_active:
         return None
-        
+    
+    state_data = ctx.state_data
     # Return journey info for validation messages
     return {
         "domain": state_data.get("domain"),
@@ -102,37 +167,19 @@ def _format_captains_log(domain: str, version: str, status: str, step_info: str
 
 def _extract_completed_filename(content: str, tag: str) -> Optional[str]:
     """Extract filename from diary entry content."""
-    if '🧭 @waypoint:' not in content:
-        return None
-    
-    try:
-        # Extract filename from 🧭 @waypoint:domain:version(filename.md) format
-        waypoint_start = content.find('🧭 @waypoint:')
-        waypoint_part = content[waypoint_start:]
-        paren_start = waypoint_part.find('(')
-        paren_end = waypoint_part.find(')')
-        
-        if paren_start == -1 or paren_end == -1:
-            return None
-            
-        filename = waypoint_part[paren_start + 1:paren_end]
-        return filename if filename else None
-        
-    except Exception as e:
-        logger.debug(f"Error extracting filename: {e}", exc_info=True)
-        return None
+    # Extract filename from 🧭 @waypoint:domain:version(filename.md) format
+    match = _WAYPOINT_RE.search(content)
+    return match.group(1) if match else None
 
 
 def _extract_completed_filenames_from_registry_data(diary_data: Dict, tag: str) -> List[str]:
     """Extract completed filenames from diary registry data."""
-    completed = []
-    for entry_id, entry_data in diary_data.items():
-        if isinstance(entry_data, dict):
-            content = entry_data.get('content', '')
-            filename = _extract_completed_filename(content, tag)
-            if filename:
-                completed.append(filename)
-    return completed
+    filenames = (
+        _extract_completed_filename(entry_data.get('content', ''), tag)
+        for entry_data in diary_data.values()
+        if isinstance(entry_data, dict)
+    )
+    return [filename for filename in filenames if filename]
 
 
 def _parse_temp_file(domain: str, version: str, project_name: str = None) -> List[str]:
@@ -142,29 +189,34 @@ def _parse_temp_file(domain: str, version: str, project_name: str = None) -> Lis
     else:
         temp_file = "/tmp/waypoint_state.temp"
     try:
-        if not os.path.exists(temp_file):
-            return []
-        
-        with open(temp_file, 'r') as f:
-            content = f.read().strip()
-        
-        # Extract step count from "Completed step X/Y" format
-        import re
-        step_match = re.search(r"Completed step (\d+)/(\d+)", content)
-        if step_match:
-            completed_step = int(step_match.group(1))
-            # Return a list with the right number of dummy filenames to get the count right
-            return [f"step_{i}.md" for i in range(1, completed_step + 1)]
-        
-        # Fallback to old filename extraction if no step count found
-        filename = _extract_completed_filename(content, "")
-        return [filename] if filename else []
-        
+        return _diary_cache.load(temp_file, _read_temp_file)
+    except FileNotFoundError:
+        return []
     except Exception as e:
         logger.error(f"Error parsing temp file: {e}", exc_info=True)
         return []
 
 
+def _read_temp_file(temp_file: str) -> List[str]:
+    """Read a waypoint temp file and extract its completed pieces."""
+    with open(temp_file, 'r') as f:
+        return _parse_temp_content(f.read().strip())
+
+
+def _parse_temp_content(content: str) -> List[str]:
+    """Extract completed pieces from waypoint temp file content."""
+    # Extract step count from "Completed step X/Y" format
+    step_match = _STEP_RE.search(content)
+    if step_match:
+        completed_step = int(step_match.group(1))
+        # Return a list with the right number of dummy filenames to get the count right
+        return [f"step_{i}.md" for i in range(1, completed_step + 1)]
+    
+    # Fallback to old filename extraction if no step count found
+    filename = _extract_completed_filename(content, "")
+    return [filename] if filename else []
+
+
 def _parse_diary_entries(starlog_path: str, domain: str, version: str) -> List[str]:
     """Parse temp file to find completed pieces."""
     # Always use temp file for waypoint state tracking
@@ -179,8 +231,8 @@ def _write_to_temp_json(state_data: dict, project_name: str = None):
     else:
         temp_file = "/tmp/waypoint_state.json"
     try:
-        with open(temp_file, 'w') as f:
-            json.dump(state_data, f, indent=2)
+        with open(temp_file, 'wb') as f:
+            f.write(_json_dumps(state_data))
         logger.debug(f"Wrote to temp JSON: {state_data}")
     except Exception as e:
         logger.error(f"Error writing temp JSON: {e}", exc_info=True)
@@ -194,12 +246,33 @@ def _read_temp_json(project_name: str = None) -> dict:
     try:
         if not os.path.exists(temp_file):
             return {}
-        with open(temp_file, 'r') as f:
-            return json.load(f)
+        with open(temp_file, 'rb') as f:
+            return _json_loads(f.read())
     except Exception as e:
         logger.error(f"Error reading temp JSON: {e}", exc_info=True)
         return {}
 
+def _read_diary_registry(registry_path: str) -> dict:
+    """Read a diary registry, reusing the dict from our last write if the file is unchanged."""
+    try:
+        stamp = _file_stamp(registry_path)
+    except FileNotFoundError:
+        _registry_cache.discard(registry_path)
+        return {}
+    
+    cached = _registry_cache.get(registry_path, stamp)
+    if cached is not None:
+        return cached
+    
+    with open(registry_path, 'rb') as f:
+        return _json_loads(f.read())
+
+
+def _remember_diary_registry(registry_path: str, registry_data: dict):
+    """Record the registry contents we just wrote, keyed by the file's new stat."""
+    _registry_cache.put(registry_path, _file_stamp(registry_path), registry_data)
+
+
 def _write_diary_entry(starlog_path: str, content: str, insights: Optional[str] = None):
     """Write an entry to the starlog debug diary by directly modifying registry JSON."""
     if not starlog_path:
@@ -209,18 +282,18 @@ def _write_diary_entry(starlog_path: str, content: str, insights: Optional[str]
         # Get HEAVEN_DATA_DIR and reconstruct registry path
         heaven_data_dir = os.environ.get('HEAVEN_DATA_DIR')
         if not heaven_data_dir:
-            logger.warning("HEAVEN_DATA_DIR not set, cannot write to starlog debug diary")
+            global _heaven_data_dir_warned
+            if not _heaven_data_dir_warned:
+                logger.warning("HEAVEN_DATA_DIR not set, cannot write to starlog debug diary")
+                _heaven_data_dir_warned = True
             return
             
         # Extract project name from starlog_path
         project_name = Path(starlog_path).name
         registry_path = f"{heaven_data_dir}/registry/{project_name}_debug_diary_registry.json"
         
-        # Read existing registry
-        registry_data = {}
-        if os.path.exists(registry_path):
-            with open(registry_path, 'r') as f:
-                registry_data = json.load(f)
+        # Read existing registry (skipped if it's unchanged since our last write)
+        registry_data = _read_diary_registry(registry_path)
         
         # Create entry mimicking DebugDiaryEntry structure
         entry_id = f"diary_{uuid.uuid4().hex[:8]}"
@@ -240,8 +313,9 @@ def _write_diary_entry(starlog_path: str, content: str, insights: Optional[str]
         registry_data[entry_id] = entry
         
         # Write back to registry
-        with open(registry_path, 'w') as f:
-            json.dump(registry_data, f, indent=2)
+        with open(registry_path, 'wb') as f:
+            f.write(_json_dumps(registry_data))
+        _remember_diary_registry(registry_path, registry_data)
             
         logger.debug(f"Wrote diary entry directly to registry: {content[:50]}...")
         return
@@ -252,101 +326,64 @@ def _write_diary_entry(starlog_path: str, content: str, insights: Optional[str]
 
 def _map_filenames_to_sequence_numbers(pd: PayloadDiscovery, completed_filenames: List[str]) -> List[int]:
     """Map completed filenames back to sequence numbers."""
-    completed_numbers = []
-    
-    for piece in pd.root_files:
-        if piece.filename in completed_filenames:
-            completed_numbers.append(piece.sequence_number)
-    
-    for pieces in pd.directories.values():
-        for piece in pieces:
-            if piece.filename in completed_filenames:
-                completed_numbers.append(piece.sequence_number)
-    
-    return completed_numbers
-
-
-def _count_total_pieces(pd: PayloadDiscovery) -> int:
-    """Count total pieces in PayloadDiscovery."""
-    total = len(pd.root_files)
-    for pieces in pd.directories.values():
-        total += len(pieces)
-    return total
+    pieces = (pd.piece_for_filename(f) for f in dict.fromkeys(completed_filenames))
+    return [piece.sequence_number for piece in pieces if piece is not None]
 
 
-def _get_next_sequence_number(starlog_path: str, pd: PayloadDiscovery) -> Optional[int]:
-    """Find the next sequence number to serve based on JSON state."""
+def _get_next_sequence_number(
+    starlog_path: str,
+    pd: PayloadDiscovery,
+    state_data: Optional[dict] = None
+) -> Tuple[Optional[int], int]:
+    """
+    Find the next sequence number to serve based on JSON state.
+    
+    Args:
+        starlog_path: STARLOG project path
+        pd: Active PayloadDiscovery
+        state_data: Already-loaded JSON state (read from disk if None)
+    
+    Returns:
+        Tuple of (next sequence number or None if all complete,
+        number of waypoints already completed)
+    """
     # Try JSON state first
-    project_name = Path(starlog_path).name if starlog_path else None
-    state_data = _read_temp_json(project_name)
+    if state_data is None:
+        project_name = Path(starlog_path).name if starlog_path else None
+        state_data = _read_temp_json(project_name)
     if state_data and "last_served_sequence" in state_data:
         last_served = state_data["last_served_sequence"]
+        completed_count = state_data.get("completed_count", 0)
         
-        # Find all pieces in sequence order
-        all_pieces = []
-        for piece in pd.root_files:
-            all_pieces.append(piece)
-        for pieces in pd.directories.values():
-            all_pieces.extend(pieces)
-        
-        # Sort by sequence number
-        all_pieces.sort(key=lambda p: p.sequence_number)
-        
-        # Find next sequence after last served
-        for piece in all_pieces:
-            if piece.sequence_number > last_served:
-                return piece.sequence_number
+        # Binary-search the sorted sequence numbers for the next one after last served
+        seq_numbers = pd.sorted_sequence_numbers
+        index = bisect.bisect_right(seq_numbers, last_served)
+        if index < len(seq_numbers):
+            return seq_numbers[index], completed_count
         
-        return None  # All complete
+        return None, completed_count  # All complete
     
     # Fallback to diary parsing if no JSON state
     completed_filenames = _parse_diary_entries(starlog_path, pd.domain, pd.version)
     completed_numbers = set(_map_filenames_to_sequence_numbers(pd, completed_filenames))
     
-    # Find all pieces in sequence order
-    all_pieces = []
-    for piece in pd.root_files:
-        all_pieces.append(piece)
-    for pieces in pd.directories.values():
-        all_pieces.extend(pieces)
-    
-    # Sort by sequence number
-    all_pieces.sort(key=lambda p: p.sequence_number)
-    
     # Find first uncompleted piece
-    for piece in all_pieces:
+    for piece in pd.sorted_pieces:
         if piece.sequence_number not in completed_numbers:
-            return piece.sequence_number
+            return piece.sequence_number, len(completed_numbers)
     
-    return None  # All complete
+    return None, len(completed_numbers)  # All complete
 
 
 def _find_piece_by_sequence(pd: PayloadDiscovery, sequence_num: int) -> Optional[str]:
     """Find piece filename by sequence number."""
-    for p in pd.root_files:
-        if p.sequence_number == sequence_num:
-            return p.filename
-    
-    for pieces in pd.directories.values():
-        for p in pieces:
-            if p.sequence_number == sequence_num:
-                return p.filename
-    
-    return None
+    piece = pd.get_piece(sequence_num)
+    return piece.filename if piece else None
 
 
 def _get_piece_by_sequence(pd: PayloadDiscovery, sequence_num: int):
     """Get piece object by sequence number."""
-    for piece in pd.root_files:
-        if piece.sequence_number == sequence_num:
-            return piece
-    
-    for pieces in pd.directories.values():
-        for piece in pieces:
-            if piece.sequence_number == sequence_num:
-                return piece
-    
-    return None
+    return pd.get_piece(sequence_num)
 
 
 def _is_file_path(path_or_key: str) -> bool:
@@ -379,6 +416,7 @@ def _create_flattened_pd(work_loop_subchain: str, registry_key: str, _visited: s
         raise ValueError(f"Failed to load/resolve subchain '{work_loop_subchain}': {e}")
     
     # Create StarlogPayloadDiscoveryConfig instance
+    from starlog_mcp.models import StarlogPayloadDiscoveryConfig
     starlog_pd = StarlogPayloadDiscoveryConfig()
     
     # Get the base structure as dict
@@ -457,7 +495,7 @@ def _resolve_registry_key(registry_key: str, _visited: set = None) -> str:
     
     _visited.add(registry_key)
     
-    starlog = Starlog()
+    starlog = _get_starlog()
     flight_data = starlog._get_flight_configs_registry_data()
     
     # Find config by name
@@ -502,7 +540,8 @@ def start_waypoint_journey(config_path: str, starlog_path: str, notes: str = "")
     logger.debug(f"start_waypoint_journey: config={config_path}, starlog={starlog_path}")
     
     # Check if journey already active for this starlog path
-    active_journey = _get_active_journey_info(starlog_path)
+    ctx = WaypointContext.load(starlog_path)
+    active_journey = _get_active_journey_info(starlog_path, ctx)
     if active_journey:
         journey_info = f"Domain: {active_journey['domain']} | Progress: {active_journey['progress']} | Last: {active_journey['last_file']}"
         return f"❌ You can't start a new journey because you are on a journey. Either continue or abort it first. | {journey_info}"
@@ -510,11 +549,11 @@ def start_waypoint_journey(config_path: str, starlog_path: str, notes: str = "")
     try:
         # Resolve registry key or file path to actual PayloadDiscovery file
         resolved_path = _resolve_config_path_or_key(config_path)
-        pd = load_payload_discovery(resolved_path)
+        pd = _load_payload_discovery_cached(resolved_path)
         # Store config_path in JSON state instead of in-memory dict
         config_filename = Path(config_path).stem
         
-        total_pieces = _count_total_pieces(pd)
+        total_pieces = pd.total_pieces
         config_filename = Path(config_path).stem
         
         # Write START message
@@ -528,21 +567,19 @@ def start_waypoint_journey(config_path: str, starlog_path: str, notes: str = "")
         )
         
         # Check if previous journey ended, allow restart
-        project_name = Path(starlog_path).name
-        state_data = _read_temp_json(project_name)
-        if state_data.get("status") == "END":
+        if ctx.state_data.get("status") == "END":
             # Clear END status to allow restart
-            temp_file = f"/tmp/waypoint_state_{project_name}.json"
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+            if os.path.exists(ctx.state_file):
+                os.remove(ctx.state_file)
+            ctx.state_data = {}
             logger.debug("Cleared END status, allowing restart")
         
         # Serve first waypoint
-        first_sequence = _get_next_sequence_number(starlog_path, pd)
+        first_sequence, completed_count = _get_next_sequence_number(starlog_path, pd, ctx.state_data)
         if first_sequence is not None:
             piece = _get_piece_by_sequence(pd, first_sequence)
             if piece:
-                _write_completion_entry(starlog_path, config_path, pd, piece, 1, notes)
+                _write_completion_entry(starlog_path, config_path, pd, piece, completed_count + 1, notes)
                 return piece.content
         
         return f"🚨 Error: No waypoints found in {pd.domain}"
@@ -566,7 +603,7 @@ def _write_waypoint_log(starlog_path: str, pd: PayloadDiscovery, status: str, st
 
 def _write_completion_entry(starlog_path: str, config_path: str, pd: PayloadDiscovery, piece, completed_count: int, notes: str = ""):
     """Write completion entry to STARLOG diary and update JSON state."""
-    total = _count_total_pieces(pd)
+    total = pd.total_pieces
     step_info = f"Completed step {completed_count}/{total} - {piece.filename} served"
     
     # Always write JSON state for waypoint navigation
@@ -602,10 +639,13 @@ def _write_ended_entry(starlog_path: str, pd: PayloadDiscovery, notes: str = "")
 
 def _get_next_prompt_internal(starlog_path: str) -> str:
     """Internal logic: find last completed step, serve next step, write completion."""
-    pd = _load_payload_discovery_from_state(starlog_path)
+    # Read JSON state once; it gives the config, the position and the config_path
+    ctx = WaypointContext.load(starlog_path)
+    pd = _load_payload_discovery_from_state(starlog_path, ctx)
     if not pd:
         return "🚨 No active discovery. Call start_waypoint_journey first."
-    next_sequence = _get_next_sequence_number(starlog_path, pd)
+    
+    next_sequence, completed_count = _get_next_sequence_number(starlog_path, pd, ctx.state_data)
     
     if next_sequence is None:
         _write_ended_entry(starlog_path, pd)
@@ -615,20 +655,19 @@ def _get_next_prompt_internal(starlog_path: str) -> str:
     if not piece:
         return f"🚨 Error: Could not find piece for sequence {next_sequence}"
     
-    # Need config_path - get from state or reconstruct
-    project_name = Path(starlog_path).name if starlog_path else None
-    state_data = _read_temp_json(project_name) 
-    config_path = state_data.get("config_path") if state_data else None
-    _write_completion_entry(starlog_path, config_path, pd, piece, piece.sequence_number)
+    _write_completion_entry(starlog_path, ctx.config_path, pd, piece, completed_count + 1)
     
     return piece.content
 
 def _get_next_prompt_with_notes(starlog_path: str, notes: str = "") -> str:
     """Internal logic with notes support."""
-    pd = _load_payload_discovery_from_state(starlog_path)
+    # Read JSON state once; it gives the config, the position and the config_path
+    ctx = WaypointContext.load(starlog_path)
+    pd = _load_payload_discovery_from_state(starlog_path, ctx)
     if not pd:
         return "🚨 No active waypoint journey. Call start_waypoint_journey first."
-    next_sequence = _get_next_sequence_number(starlog_path, pd)
+    
+    next_sequence, completed_count = _get_next_sequence_number(starlog_path, pd, ctx.state_data)
     
     if next_sequence is None:
         _write_ended_entry(starlog_path, pd, notes)
@@ -638,11 +677,7 @@ def _get_next_prompt_with_notes(starlog_path: str, notes: str = "") -> str:
     if not piece:
         return f"🚨 Error: Could not find waypoint for sequence {next_sequence}"
     
-    # Need config_path - get from state or reconstruct
-    project_name = Path(starlog_path).name if starlog_path else None
-    state_data = _read_temp_json(project_name)
-    config_path = state_data.get("config_path") if state_data else None
-    _write_completion_entry(starlog_path, config_path, pd, piece, piece.sequence_number, notes)
+    _write_completion_entry(starlog_path, ctx.config_path, pd, piece, completed_count + 1, notes)
     
     return piece.content
 
@@ -664,19 +699,15 @@ def get_waypoint_progress(starlog_path: str) -> str:
     logger.debug(f"get_waypoint_progress: starlog={starlog_path}")
     
     try:
-        pd = _load_payload_discovery_from_state(starlog_path)
+        ctx = WaypointContext.load(starlog_path)
+        pd = _load_payload_discovery_from_state(starlog_path, ctx)
         if not pd:
             return "No active waypoint journey."
         
         # Get progress from JSON state directly
-        project_name = Path(starlog_path).name
-        state_data = _read_temp_json(project_name)
-        if state_data:
-            completed_count = state_data.get('completed_count', 0)
-        else:
-            completed_count = 0
+        completed_count = ctx.state_data.get('completed_count', 0)
         
-        total = _count_total_pieces(pd)
+        total = pd.total_pieces
         percentage = (completed_count / total) * 100 if total > 0 else 0
         
         return (
@@ -697,17 +728,16 @@ def abort_waypoint_journey(starlog_path: str, notes: str = "") -> str:
     
     try:
         # Check if there's an active journey
-        active_journey = _get_active_journey_info(starlog_path)
+        ctx = WaypointContext.load(starlog_path)
+        active_journey = _get_active_journey_info(starlog_path, ctx)
         if not active_journey:
             return "🪂 No active waypoint journey to abort."
         
         # Clear state files
-        project_name = Path(starlog_path).name
-        temp_json = f"/tmp/waypoint_state_{project_name}.json"
-        temp_file = f"/tmp/waypoint_state_{project_name}.temp"
+        temp_file = f"/tmp/waypoint_state_{ctx.project_name}.temp"
         
-        if os.path.exists(temp_json):
-            os.remove(temp_json)
+        if os.path.exists(ctx.state_file):
+            os.remove(ctx.state_file)
         if os.path.exists(temp_file):
             os.remove(temp_file)
             
@@ -739,11 +769,12 @@ def reset_waypoint_journey(starlog_path: str, notes: str = "") -> str:
     
     try:
         # Check if there's an active journey first
-        active_journey = _get_active_journey_info(starlog_path)
+        ctx = WaypointContext.load(starlog_path)
+        active_journey = _get_active_journey_info(starlog_path, ctx)
         if not active_journey:
             return "🌌 No active waypoint journey to reset."
             
-        pd = _load_payload_discovery_from_state(starlog_path)
+        pd = _load_payload_discovery_from_state(starlog_path, ctx)
         if not pd:
             return "🌌 No active waypoint journey to reset."
         
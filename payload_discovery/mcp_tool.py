@@ -139,11 +139,83 @@ logger.info(f"Learning complete! {progress}")
 ## TODO: Implementation
 
 - [ ] Create FastMCP server wrapper
-- [ ] Implement state reconstruction from debug diary
+- [x] Implement state reconstruction from debug diary
 - [ ] Add domain:version namespacing for multiple discoveries
-- [ ] Create helper to parse PayloadDiscovery diary entries
+- [x] Create helper to parse PayloadDiscovery diary entries
 - [ ] Add progress calculation from diary
 - [ ] Test with 3pass_autonomous_research_system example
 """
 
-# Implementation will go here after design approval
\ No newline at end of file
+import re
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from .core import PayloadDiscovery
+from .heaven_pis_integration import DiscoveryReceipt
+
+# "[PayloadDiscovery:{domain}:{version}] Completed: {filename} ({k}/{N} pieces, ...)".
+# Filenames may contain spaces, and the count suffix is optional.
+_DIARY_RE = re.compile(
+    r'\[PayloadDiscovery:([^:\]]+):([^\]]+)\] Completed:\s*(.*?)\s*(?:\((\d+)/(\d+) pieces|\Z)'
+)
+
+
+def _parse_diary_line(content: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Parse a "Completed:" diary entry.
+    
+    Returns:
+        (domain, version, filename), or None if the entry is not a
+        PayloadDiscovery completion
+    """
+    match = _DIARY_RE.search(content)
+    if match is None:
+        return None
+    return match.group(1), match.group(2), match.group(3)
+
+
+def rebuild_receipts(
+    entries: Iterable[Dict[str, Any]],
+    discoveries: Dict[Tuple[str, str], PayloadDiscovery]
+) -> Dict[Tuple[str, str], DiscoveryReceipt]:
+    """
+    Rebuild receipts for the given discoveries from STARLOG debug diary entries.
+    
+    The entries are scanned once and completions are grouped by
+    (domain, version), so several curricula sharing one diary cost a single
+    pass.
+    
+    Args:
+        entries: Diary entry dicts, as STARLOG stores them
+        discoveries: (domain, version) -> loaded PayloadDiscovery. Entries for
+            other discoveries, or naming unknown files, are skipped.
+    
+    Returns:
+        Mapping of (domain, version) to its reconstructed DiscoveryReceipt,
+        for every requested discovery
+    """
+    completed: Dict[Tuple[str, str], Set[int]] = {key: set() for key in discoveries}
+    
+    for entry in entries:
+        parsed = _parse_diary_line(entry.get('content', ''))
+        if parsed is None:
+            continue
+        domain, version, filename = parsed
+        pd = discoveries.get((domain, version))
+        if pd is None:
+            continue
+        piece = pd.piece_for_filename(filename)
+        if piece is not None:
+            completed[(domain, version)].add(piece.sequence_number)
+    
+    return {
+        key: DiscoveryReceipt(
+            domain=pd.domain,
+            version=pd.version,
+            completed_pieces=completed[key],
+            total_pieces=pd.total_pieces
+        )
+        for key, pd in discoveries.items()
+    }
+
+
+# Remaining implementation will go here after design approval
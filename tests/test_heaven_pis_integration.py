@@ -0,0 +1,31 @@
+from payload_discovery.heaven_pis_integration import DiscoveryReceipt
+
+
+def test_receipt_accepts_completed_pieces_as_list():
+    receipt = DiscoveryReceipt(
+        domain="research",
+        version="v1",
+        completed_pieces=[1, 1, 3],
+        total_pieces=3
+    )
+
+    receipt.mark_piece_complete(2)
+
+    assert receipt.completed_pieces == {1, 2, 3}
+    assert receipt.is_complete()
+
+
+def test_receipt_dict_round_trip():
+    receipt = DiscoveryReceipt(domain="research", version="v1", completed_pieces=[3, 1], total_pieces=4)
+
+    data = receipt.to_dict()
+
+    assert data["completed_pieces"] == [1, 3]
+    assert DiscoveryReceipt.from_dict(data) == receipt
+
+
+def test_receipt_from_json_accepts_wire_bytes():
+    receipt = DiscoveryReceipt(domain="research", version="v1", completed_pieces={2}, total_pieces=2)
+
+    assert DiscoveryReceipt.from_json(receipt.to_wire()) == receipt
+    assert DiscoveryReceipt.from_json(receipt.to_json()) == receipt
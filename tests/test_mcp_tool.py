@@ -0,0 +1,40 @@
+from payload_discovery.core import PayloadDiscovery, PayloadDiscoveryPiece
+from payload_discovery.mcp_tool import _parse_diary_line, rebuild_receipts
+
+
+def _discovery():
+    return PayloadDiscovery(
+        domain="research",
+        version="v1",
+        entry_point="00_Overview.md",
+        root_files=[
+            PayloadDiscoveryPiece(sequence_number=0, filename="00_Overview.md", title="Overview", content="a"),
+            PayloadDiscoveryPiece(sequence_number=1, filename="01 Setup Notes.md", title="Setup", content="b"),
+        ]
+    )
+
+
+def test_parse_diary_line_keeps_spaces_in_filenames():
+    parsed = _parse_diary_line("[PayloadDiscovery:research:v1] Completed: 01 Setup Notes.md (2/2 pieces, 100.0%)")
+
+    assert parsed == ("research", "v1", "01 Setup Notes.md")
+
+
+def test_parse_diary_line_ignores_other_entries():
+    assert _parse_diary_line("[PayloadDiscovery:research:v1] Started discovery system") is None
+
+
+def test_rebuild_receipts_groups_by_discovery():
+    pd = _discovery()
+    entries = [
+        {"content": "[PayloadDiscovery:research:v1] Completed: 00_Overview.md (1/2 pieces, 50.0%)"},
+        {"content": "[PayloadDiscovery:other:v1] Completed: 01 Setup Notes.md (1/9 pieces, 11.1%)"},
+        {"content": "[PayloadDiscovery:research:v1] Completed: 01 Setup Notes.md (2/2 pieces, 100.0%)"},
+    ]
+
+    receipts = rebuild_receipts(entries, {("research", "v1"): pd})
+
+    receipt = receipts[("research", "v1")]
+    assert receipt.completed_pieces == {0, 1}
+    assert receipt.total_pieces == 2
+    assert receipt.is_complete()